@@ -51,6 +51,7 @@ class Config:
 
         self._merged_config_dict = {}
         self._specific_config_dict = {}
+        self._flat_config_dict = None
 
         self.nested = "." in key
         self.specify_file_path(reload=False)
@@ -178,6 +179,7 @@ class Config:
         # Sanity check
         if self._specific_config_dict is None or self._merged_config_dict is None:
             raise ConfigError(f"Failed to extract config dict for key '{self._key}'.")
+        self._flat_config_dict = None
 
         logger().debug(
             f">>> UPDATED {self._key} CONFIG\n",
@@ -240,10 +242,20 @@ class Config:
     def get(self, key: str = "", default=None) -> any | None:
         if key == "":
             return copy.deepcopy(self._merged_config_dict)
+        # Leaf keys resolve from the flat view, no path walk
+        flat = self.get_flat()
+        if key in flat:
+            return copy.deepcopy(flat[key])
         return copy.deepcopy(
             utilities.dict_path(self._merged_config_dict, key, default=default)
         )
 
+    def get_flat(self) -> dict:
+        """Get the merged config as a flat dotted-path dict (shared, do not mutate)."""
+        if self._flat_config_dict is None:
+            self._flat_config_dict = utilities.flatten_dict(self._merged_config_dict)
+        return self._flat_config_dict
+
     def print(self, output: lambda *args, **kwargs: None = None) -> None:
         if output is None:
             output = logger().print
@@ -296,6 +308,7 @@ class Config:
             parent_cfg._merged_config_dict = utilities.deep_merge_dicts(
                 parent_cfg._merged_config_dict, dump_dict
             )
+            parent_cfg._flat_config_dict = None
 
         # Success.
         logger().success(f"Config {self._key} dumped to '{dump_file}'.")
@@ -9,10 +9,9 @@ from typing import TYPE_CHECKING, Callable, cast
 if TYPE_CHECKING:
     from src import Config
 
-import random, re, sys
-from io import StringIO
+import functools, random, re, sys
 from time import sleep
-from typing import Literal, TextIO, Tuple
+from typing import Iterator, Literal, NamedTuple, TextIO, Tuple
 from src import utilities
 
 
@@ -37,15 +36,36 @@ _ANSI_CODES = {
     "di": [2],  # dim
 }
 
+# Escape text per shortcut tag
+_ANSI_ESC = {tag: f"\x1b[{codes[0]}m" for tag, codes in _ANSI_CODES.items()}
+
+# Raw ANSI escape sequence
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+_ansi_escape_match = _ANSI_ESCAPE_RE.match
+
 # Markers and pattern /;pattern/
 _ANSI_MARK = "/;"
 _S_END_MARK = _ANSI_MARK[::-1]
-_ansi_pattern = (
-    lambda tag: f"{_ANSI_MARK}{tag}{_S_END_MARK if tag.split('/')[0] in _s_keys_matches.keys() else _ANSI_MARK[0]}"
-)
+
+
+# Data print path settings (force_inline, compact), compiled once
+@functools.lru_cache(maxsize=64)
+def _setting_re(setting: str) -> re.Pattern:
+    return re.compile(setting)
+
+
 # Specials: /;pattern/args;/
 # https://www.compart.com/en/unicode/
-_enclose = lambda c, *args: f"{c}" if not args[0] else f"/;{';'.join(args)}/{c}/;"
+def _enclose(c: str, *args: str) -> str:
+    # Unstyled glyph, the common case
+    if not args[0]:
+        return c
+    # Single style, skip the join
+    if len(args) == 1:
+        return f"/;{args[0]}/{c}/;"
+    return f"/;{';'.join(args)}/{c}/;"
+
+
 _specials = {
     "__kraken/;/": lambda *args: f"/;__kraken/--;/;__kraken/--;/;/",
     "_cross/s;;/": lambda *args: _enclose("✗", *args),
@@ -55,84 +75,122 @@ _specials = {
     "_repeat/c;i;/": lambda *args: f"{args[0]*max(1,int(args[1]))}",
 }
 _s_keys_matches = dict([(key.split("/")[0], val) for key, val in _specials.items()])
-_ansi_text = lambda codes: f"\x1b[{';'.join(str(c) for c in codes)}m"
-_ansi_tag_text = (
-    lambda tag: f"\x1b[{';'.join(str(c) for c in [_ANSI_CODES[t][0] for t in tag.split(';')])}m"
-)
 
 
-def _detect_ansi_pattern(string: str) -> Tuple[str, str]:
+@functools.lru_cache(maxsize=256)
+def _special_text(tag: str, args: str) -> str:
+    # Specials are pure and few distinct ones are used, expand each once
+    return _s_keys_matches[tag](*args.split(";"))
 
-    if not string.startswith(_ANSI_MARK):
-        return ("", string)
 
-    test_str = string[len(_ANSI_MARK) :]
-    hit = False
-    ansi_codes = []
-    max_lookahead_error = 20
-    lookahead_error = lambda: (
-        string[:max_lookahead_error]
-        + ("..." if len(string) > max_lookahead_error else "")
-    )
+# Escape text per code sequence
+@functools.lru_cache(maxsize=128)
+def _ansi_text(codes: Tuple[int, ...]) -> str:
+    # Only a handful of code sequences are ever used, build each one once
+    return f"\x1b[{';'.join(map(str, codes))}m"
 
-    max_code_len = max(len(key) for key in _specials)  # arbitrary
-    max_lookahead = max_code_len + 1  # +1 for trailing / or ;
-    lookahead = test_str[0:max_lookahead]
-
-    # search specials then shortcuts then single
-    tags = _s_keys_matches.keys() | _ANSI_CODES.keys()
-    for tag in tags:
-        if lookahead.startswith(f"{tag}"):
-            hit = tag
-            if lookahead.startswith(f"{tag}/"):
-                pattern = ""
-                text = ""
-                if tag in _s_keys_matches.keys():
-                    # lookup to backward marker after "/"
-                    lookahead = test_str[len(f"{tag}/") :].split(_S_END_MARK)
-                    if len(lookahead) < 2:
-                        raise SyntaxError(
-                            f"Missing special trailing end marker {_S_END_MARK} in: {lookahead_error()}"
-                        )
-                    lookahead = lookahead[0]
-                    args = lookahead.split(";")
-                    pattern = _ansi_pattern(f"{tag}/{lookahead}")
-                    text = _s_keys_matches[tag](*args)
-                else:
-                    pattern = _ansi_pattern(tag)
-                    text = _ansi_text(_ANSI_CODES[tag])
-                return (pattern, text)
-            break
 
-    if hit and f";" not in lookahead:
-        raise SyntaxError(
-            f"Invalid pattern in: {lookahead_error()}. Hit {hit} with missing trailing ';' or '/'"
-        )
+@functools.lru_cache(maxsize=32)
+def _ansi_tag_text(tag: str) -> str:
+    return _ansi_text(tuple(_ANSI_CODES[t][0] for t in tag.split(";")))
+
+
+# Pattern detection constants
+_SPECIAL_TAGS = frozenset(_s_keys_matches)
+_ALL_TAGS = _SPECIAL_TAGS | frozenset(_ANSI_CODES)
+_MAX_CODE_LEN = max(len(key) for key in _specials)  # arbitrary
+_MAX_LOOKAHEAD = _MAX_CODE_LEN + 1  # +1 for trailing / or ;
+
+# Chars a tag or a numeric code can start with, anything else is a reset
+_TAG_START_CHARS = frozenset(tag[0] for tag in _ALL_TAGS) | frozenset("0123456789")
+
+# Any special or shortcut tag, longest first, and its trailing "/" if any
+_TAG_RE = re.compile(
+    "("
+    + "|".join(re.escape(tag) for tag in sorted(_ALL_TAGS, key=len, reverse=True))
+    + ")(/)?"
+)
+
+# Shortcuts or numeric codes separated by ";", up to the trailing "/"
+_CODE_RE = (
+    "(?:[0-9]+|"
+    + "|".join(re.escape(tag) for tag in sorted(_ANSI_CODES, key=len, reverse=True))
+    + ")"
+)
+_COMBINATION_RE = re.compile(f"({_CODE_RE}(?:;{_CODE_RE})*)/")
+
 
-    # lookahead for combinations.
-    lookahead = test_str[0:max_lookahead].split("/")[0]
-    tags = lookahead.split(";")
+@functools.lru_cache(maxsize=128)
+def _combination_text(combination: str) -> str:
     ansi_codes = []
-    for tag in tags:
-        # Numeric code
+    for tag in combination.split(";"):
+        # Numeric code or shortcut codes
         if tag.isdigit():
             ansi_codes.append(int(tag))
-        # Maybe /;some random text
-        elif tag not in _ANSI_CODES.keys():
-            # consider it a single reset tag '/;'
-            return (_ANSI_MARK, _ansi_text(_ANSI_CODES["r"]))
-        # Compose shortcuts
         else:
             ansi_codes.extend(_ANSI_CODES[tag])
-        # End on trailing mark
-        if f"{tag}/" in lookahead + "/":
-            return (_ansi_pattern(lookahead), _ansi_text(ansi_codes))
-    # Strict trailing mark
-    raise SyntaxError(
-        f"Invalid pattern in: {lookahead_error()}. Hit {_ansi_pattern(lookahead)} with missing trailing '/'"
+    return _ansi_text(tuple(ansi_codes))
+
+
+# Chars interrupting plain text runs while writing
+_SENTINELS_RE = re.compile("\n|\x1b|" + re.escape(_ANSI_MARK))
+_PLAIN_SENTINELS_RE = re.compile("\n|\x1b")
+
+
+def _lookahead_error(string: str, pos: int = 0, max_lookahead_error: int = 20) -> str:
+    """Head of a faulty pattern string from pos, for error messages."""
+    return string[pos : pos + max_lookahead_error] + (
+        "..." if len(string) - pos > max_lookahead_error else ""
     )
 
 
+def _detect_ansi_pattern(string: str, pos: int = 0) -> Tuple[int, str]:
+    """Detect the pattern at pos, return its end index and its replacement text."""
+
+    if not string.startswith(_ANSI_MARK, pos):
+        return (pos, "")
+
+    # Never copy the tail, only a bounded lookahead
+    start = pos + len(_ANSI_MARK)
+    hit = False
+
+    # Bare '/;' reset, the most frequent pattern
+    if start == len(string) or string[start] not in _TAG_START_CHARS:
+        return (start, _ANSI_ESC["r"])
+
+    lookahead = string[start : start + _MAX_LOOKAHEAD]
+
+    # search specials and shortcuts in one go
+    tag_match = _TAG_RE.match(lookahead)
+    if tag_match:
+        tag, closed = tag_match.groups()
+        hit = tag
+        if closed:
+            if tag in _SPECIAL_TAGS:
+                # lookup to backward marker after "/"
+                args_start = start + tag_match.end()
+                args_end = string.find(_S_END_MARK, args_start)
+                if args_end < 0:
+                    raise SyntaxError(
+                        f"Missing special trailing end marker {_S_END_MARK} in: {_lookahead_error(string, pos)}"
+                    )
+                args = string[args_start:args_end]
+                return (args_end + len(_S_END_MARK), _special_text(tag, args))
+            return (start + tag_match.end(), _ANSI_ESC[tag])
+
+    if hit and ";" not in lookahead:
+        raise SyntaxError(
+            f"Invalid pattern in: {_lookahead_error(string, pos)}. Hit {hit} with missing trailing ';' or '/'"
+        )
+
+    # Combinations of shortcuts and numeric codes in one go, else /;some random text
+    combination = _COMBINATION_RE.match(string, start)
+    if combination:
+        return (combination.end(), _combination_text(combination.group(1)))
+    # consider it a single reset tag '/;'
+    return (start, _ANSI_ESC["r"])
+
+
 _default_kwargs = {
     "animate": False,
     "flush_rate": [5, 15],
@@ -164,33 +222,132 @@ _default_kwargs = {
 }
 
 
+# Flat view of _default_kwargs, built on first use.
+_flat_default_kwargs: dict | None = None
+
+
+def _merge_flat(flat: dict, source: dict) -> dict:
+    """Merge a flat dict into another, None values do not shadow."""
+    for key, value in source.items():
+        if value is not None:
+            flat[key] = value
+    return flat
+
+
+def _flat_logger_defaults(logger: Logger) -> dict:
+    """Resolve the flat kwargs defaults of a logger (hardcoded < default < config).
+
+    The result is cached on the logger and shared, do not mutate."""
+    global _flat_default_kwargs
+    if logger._name == "default":
+        # We are in default logger, use hardcoded defaults
+        if _flat_default_kwargs is None:
+            _flat_default_kwargs = utilities.flatten_dict(_default_kwargs)
+        base = _flat_default_kwargs
+    else:
+        # Get defaults from default logger
+        base = _flat_logger_defaults(get("default"))
+    config_flat = logger._config.get_flat() if logger._config is not None else None
+    # Both sources are rebuilt, never mutated, when they change
+    cached = logger._flat_defaults
+    if cached is not None and cached[0] is base and cached[1] is config_flat:
+        return cached[2]
+    flat = dict(base)
+    if config_flat is not None:
+        _merge_flat(flat, config_flat)
+    logger._flat_defaults = (base, config_flat, flat)
+    return flat
+
+
+def _resolve_affix(affix: Tuple[str, str]) -> Tuple[str, str]:
+    """Resolve a marker affix to escapes, so _write does not parse it again."""
+    resolved = []
+    for marker in affix:
+        try:
+            end, text = _detect_ansi_pattern(marker)
+        except SyntaxError:
+            # Let _write report it with the surrounding text
+            return affix
+        if end != len(marker):
+            return affix
+        resolved.append(text)
+    return tuple(resolved)
+
+
+class _WriteOptions(NamedTuple):
+    """Options read by _write, resolved once per write() call."""
+
+    animate: bool
+    flush_rate: list[int]
+    process_ansi: bool
+    muted: bool
+
+
 class LoggerKwargs:
 
     def __init__(self, logger: Logger, **kwargs):
         self._logger = logger
         self._kwargs = kwargs
+        # Resolve every key once: kwargs shadow the logger defaults.
+        self._flat = _flat_logger_defaults(logger)
+        if kwargs:
+            self._flat = _merge_flat(dict(self._flat), utilities.flatten_dict(kwargs))
+        self._styles: dict[str, any] | None = None
+        self._style_affixes: dict[str, Tuple[str, str]] = {}
 
     def get(self, dict_path: str):
+        value = self._flat.get(dict_path)
+        if value is None:
+            raise RuntimeError(f"Missing Logger default kwarg key: '{dict_path}'")
+        return value
+
+    def get_style(self, style: str):
+        # Data print styles are looked up per token, resolve them on first use.
+        if self._styles is None:
+            prefix = "data_print.styles."
+            self._styles = {
+                key[len(prefix) :]: value
+                for key, value in self._flat.items()
+                if key.startswith(prefix) and value is not None
+            }
+        value = self._styles.get(style)
+        if value is None:
+            return self.get(f"data_print.styles.{style}")
+        return value
+
+    def get_style_affix(self, style: str) -> Tuple[str, str]:
+        # (prefix, suffix) enclosing a text in the given style
+        affix = self._style_affixes.get(style)
+        if affix is None:
+            if self.get_style("enable"):
+                affix = (f"/;{self.get_style(style)}/", _ANSI_MARK)
+                if self.get("ansi"):
+                    affix = _resolve_affix(affix)
+            else:
+                affix = ("", "")
+            self._style_affixes[style] = affix
+        return affix
 
-        # Get value in knwargs first
-        value = utilities.dict_path(self._kwargs, dict_path)
-        if value is not None:
-            return value
-
-        # Prepare default fallback
-        if self._logger._name == "default":
-            # We are in default logger, use hardcoded defaults
-            default = utilities.dict_path(_default_kwargs, dict_path)
-            if default is None:
-                raise RuntimeError(f"Missing Logger default kwarg key: '{dict_path}'")
-        else:
-            # Get default from default logger
-            default = LoggerKwargs(get("default")).get(dict_path)
 
-        # Get value from config with default fallback
-        if self._logger._config is not None:
-            return self._logger._config.get(dict_path, default=default)
-        return default
+def _isatty(stream: TextIO) -> bool:
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return bool(isatty()) if callable(isatty) else False
+    except ValueError:
+        # Closed stream
+        return False
+
+
+# Per-class cache of to_dict() support for _write_value.
+_has_to_dict: dict[type, bool] = {}
+
+# Per-class value style for write_scalar (bool is its own type, not an int).
+_value_styles: dict[type, str] = {
+    bool: "bool",
+    int: "num",
+    float: "num",
+    str: "str",
+}
 
 
 class DataPrinter:
@@ -199,159 +356,230 @@ class DataPrinter:
         self._logger = logger
 
     def _default_inline(self, dl: dict | list) -> bool:
-        # Check we are checking from the inline-checker logger itself
-        if self._logger._name == "inline-checker":
-            return True
-        # Create a temporary logger to measure length.
-        logger = Logger(
-            "inline-checker",
-            stream=StringIO(),
-        )
-        # Write the data to the temporary logger forcing inline mode
-        logger.write(
-            dl,
-            ansi=False,
-            animate=False,
-            data_print={
-                "force_inline": True,
-                "compact": self._logger._kwargs.get("data_print.compact"),
-                "styles": {"enable": False},
-            },
-        )
-
         max_inline = self._logger._kwargs.get("data_print.max_inline")
-        remaining = max_inline - len(self._logger._indents[-1])
-        to_write = len(cast(StringIO, logger._stream).getvalue())
-        if to_write > remaining:
-            return False
-        return True
+        remaining = max_inline - self._logger._indents[-1]
+        compact = self._logger._kwargs.get("data_print.compact")
+        return self._inline_len(dl, remaining, ["root"], compact) <= remaining
+
+    def _inline_len(self, v: any, budget: int, path: list, compact) -> int:
+        """Length of v written inline and unstyled, stops counting past budget."""
+        if isinstance(v, dict):
+            items = v.items()
+        elif isinstance(v, list):
+            items = enumerate(v)
+        elif self._has_to_dict(v):
+            items = v.to_dict().items()
+        elif isinstance(v, str):
+            return len(v) + 2
+        else:
+            return len(str(v))
+
+        # Brackets alone overflow, do not descend any further
+        if budget < 2:
+            return 2
+
+        # Same layout as _write_dict / _write_list in force inline mode
+        keyed = not isinstance(v, list)
+        sep_len = 1 if self._path_matches(compact, path) else 2
+        length = 2
+        for i, (key, item) in enumerate(items):
+            if i:
+                length += sep_len
+            if keyed:
+                length += len(str(key)) + sep_len
+            path.append(key)
+            length += self._inline_len(item, budget - length, path, compact)
+            path.pop()
+            if length > budget:
+                break
+        return length
+
+    def _path_matches(self, setting: bool | str, path: list) -> bool:
+        if isinstance(setting, bool):
+            return setting
+        elif isinstance(setting, str) and setting:
+            return _setting_re(setting).search(".".join(map(str, path))) is not None
+        return False
 
     def get_style(self, style: str) -> str:
-        return self._logger._kwargs.get(f"data_print.styles.{style}")
+        return self._logger._kwargs.get_style(style)
 
     def build_simple_style(self, style: str, text: str) -> str:
-        if not self._logger._kwargs.get("data_print.styles.enable"):
-            return text
-        return f"/;{self.get_style(style)}/{text}/;"
-
-    def full_current_path(self) -> str:
-        return ".".join(map(str, self._logger._current_path))
+        prefix, suffix = self._logger._kwargs.get_style_affix(style)
+        return prefix + text + suffix
 
     def force_inline(self) -> bool:
         force_inline = self._logger._kwargs.get("data_print.force_inline")
-        if isinstance(force_inline, bool):
-            return force_inline
-        elif isinstance(force_inline, str) and force_inline:
-            return re.search(rf"{force_inline}", self.full_current_path()) is not None
-        return False
+        return self._path_matches(force_inline, self._logger._current_path)
 
     def compact(self) -> bool:
         compact = self._logger._kwargs.get("data_print.compact")
-        if isinstance(compact, bool):
-            return compact
-        elif isinstance(compact, str) and compact:
-            return re.search(rf"{compact}", self.full_current_path()) is not None
-        return False
+        return self._path_matches(compact, self._logger._current_path)
 
-    def decorate(self, decoration: str, type: str = "") -> str:
+    def decorate(self, decoration: str) -> str:
         path = self._logger._current_path
-        if decoration == "start" or decoration == "end":
-            str_decoration = ""
-            if type == "list":
-                str_decoration = "[" if decoration == "start" else "]"
-            elif type == "dict":
-                str_decoration = "{" if decoration == "start" else "}"
-            return self.build_simple_style("sep", str_decoration)
-        elif decoration == "comma":
-            return self.build_simple_style("sep", ",")
-        elif decoration == "item":
+        if decoration == "item":
             if self._logger._kwargs.get("data_print.decorate_items"):
                 if isinstance(path[-1], int):
                     return self.build_simple_style("arri", f" {str(path[-1])} ")
                 else:
                     return f" /;_arrow/{self.get_style("obji")};//; "
-        elif decoration == "key":
-            return self.build_simple_style(
-                "objk", str(path[-1]) + self.build_simple_style("sep", ":")
-            )
         return ""
 
-    def decorate_value(self, value: any) -> str:
+    def _value_style(self, value: any) -> str:
         if isinstance(value, bool):
-            return self.build_simple_style("bool", str(value))
-        elif isinstance(value, int) or isinstance(value, float):
-            return self.build_simple_style("num", str(value))
+            return "bool"
+        elif isinstance(value, (int, float)):
+            return "num"
         elif isinstance(value, str):
-            return self.build_simple_style("str", f"'{str(value)}'")
+            return "str"
         elif isinstance(value, Path):
-            return self.build_simple_style("path", f"{str(value)}")
+            return "path"
         else:
-            return self.build_simple_style("unkn", f"{str(value)}")
-
-    def _write_dict(self, d: dict) -> None:
-        self._logger._write(self.decorate("start", type="dict"))
+            return "unkn"
+
+    def write_sep(self, sep: str, tail: str = "") -> None:
+        # tail: plain unstyled text written right after the separator
+        prefix, suffix = self._logger._kwargs.get_style_affix("sep")
+        if prefix.startswith(_ANSI_MARK):
+            # Unresolved markers, let _write interpret them
+            return self._logger._write(prefix + sep + suffix + tail)
+        self._logger._write_escaped(prefix, sep, suffix, tail)
+
+    def write_key(self, key: any, tail: str = "") -> None:
+        # tail: plain unstyled text written right after the key
+        objk_prefix, objk_suffix = self._logger._kwargs.get_style_affix("objk")
+        sep_prefix, sep_suffix = self._logger._kwargs.get_style_affix("sep")
+        if objk_prefix.startswith(_ANSI_MARK) or sep_prefix.startswith(_ANSI_MARK):
+            # Unresolved markers, let _write interpret them but not the key
+            self._logger._write(objk_prefix)
+            self._logger._write_plain(str(key))
+            return self._logger._write(
+                sep_prefix + ":" + sep_suffix + objk_suffix + tail
+            )
+        # Resolved escapes: the key is written as is, never scanned for markers
+        self._logger._write_escaped(objk_prefix, str(key), "")
+        self._logger._write_escaped(sep_prefix, ":", sep_suffix + objk_suffix, tail)
+
+    def write_scalar(self, value: any) -> None:
+        # One dict lookup per scalar, the isinstance chain runs once per type
+        cls = type(value)
+        style = _value_styles.get(cls)
+        if style is None:
+            style = self._value_style(value)
+            _value_styles[cls] = style
+        text = f"'{value}'" if style == "str" else str(value)
+        prefix, suffix = self._logger._kwargs.get_style_affix(style)
+        if prefix.startswith(_ANSI_MARK):
+            # Unresolved markers, let _write interpret them but not the value
+            self._logger._write(prefix)
+            self._logger._write_plain(text)
+            return self._logger._write(suffix)
+        # Resolved escapes: the value is written as is, never scanned for markers
+        self._logger._write_escaped(prefix, text, suffix)
+
+    def _write_dict(self, d: dict) -> Iterator[any]:
+        # Yields entry values, written by _write_value
+        self.write_sep("{")
         self._logger._indent()
-        inline = self._default_inline(d) or self.force_inline()
+        # Forced inline makes the dry-run measurement useless.
+        inline = self.force_inline() or self._default_inline(d)
         inlining = inline
         compacting = self.compact()
-        for key, item in d.items():
+        # Loop invariant decorations
+        decorating = (
+            not inline
+            and not compacting
+            and self._logger._kwargs.get("data_print.decorate_items")
+        )
+        space = "" if compacting else " "
+        last_index = len(d) - 1
+        for i, (key, item) in enumerate(d.items()):
             self._logger._current_path.append(key)
-            first = key == list(d.keys())[0]
-            last = key == list(d.keys())[-1]
+            first = i == 0
+            last = i == last_index
             if first:
                 inlining = True
             if not inlining:
                 self._logger._new_line(" ")
-            if not inline and not compacting:
+            if decorating:
                 self._logger._write(self.decorate("item"))
-            self._logger._write(self.decorate("key"))
-            if not compacting:
-                self._logger._write(" ")
-            self._write_value(item)
+            self.write_key(key, space)
+            yield item
             if not last:
-                self._logger._write(self.decorate("comma"))
-                if not compacting:
-                    self._logger._write(" ")
+                self.write_sep(",", space)
             self._logger._current_path.pop()
             inlining = inline
-        self._logger._write(self.decorate("end", type="dict"))
+        self.write_sep("}")
         self._logger._dindent()
 
-    def _write_list(self, l: list) -> None:
-        self._logger._write(self.decorate("start", type="list"))
+    def _write_list(self, l: list) -> Iterator[any]:
+        # Yields entry values, written by _write_value
+        self.write_sep("[")
         self._logger._indent()
-        inline = self._default_inline(l) or self.force_inline()
+        # Forced inline makes the dry-run measurement useless.
+        inline = self.force_inline() or self._default_inline(l)
         inlining = inline
         compacting = self.compact()
+        # Loop invariant decorations
+        decorating = (
+            not inline
+            and not compacting
+            and self._logger._kwargs.get("data_print.decorate_items")
+        )
+        space = "" if compacting else " "
+        last_index = len(l) - 1
         for i, item in enumerate(l):
             self._logger._current_path.append(i)
             first = i == 0
-            last = i == len(l) - 1
+            last = i == last_index
             if first:
                 inlining = True
             if not inlining:
                 self._logger._new_line(" ")
-            if not inline and not compacting:
+            if decorating:
                 self._logger._write(self.decorate("item"))
-            self._write_value(item)
+            yield item
             if not last:
-                self._logger._write(self.decorate("comma"))
-                if not compacting:
-                    self._logger._write(" ")
+                self.write_sep(",", space)
             self._logger._current_path.pop()
             inlining = inline
-        self._logger._write(self.decorate("end", type="list"))
+        self.write_sep("]")
         self._logger._dindent()
 
-    def _write_value(self, v: any) -> None:
+    def _has_to_dict(self, v: any) -> bool:
+        cls = type(v)
+        has_to_dict = _has_to_dict.get(cls)
+        if has_to_dict is None:
+            has_to_dict = callable(getattr(cls, "to_dict", None))
+            _has_to_dict[cls] = has_to_dict
+        return has_to_dict
+
+    def _value_writer(self, v: any) -> Iterator[any] | None:
         if isinstance(v, dict):
-            self._write_dict(v)
+            return self._write_dict(v)
         elif isinstance(v, list):
-            self._write_list(v)
-        elif hasattr(v, "to_dict") and callable(getattr(v, "to_dict")):
-            self._write_dict(v.to_dict())
-        else:
-            self._logger._write(self.decorate_value(v))
+            return self._write_list(v)
+        elif self._has_to_dict(v):
+            return self._write_dict(v.to_dict())
+        self.write_scalar(v)
+        return None
+
+    def _write_value(self, v: any) -> None:
+        # Explicit stack of container writers, no recursion on nested data
+        stack = []
+        while True:
+            writer = self._value_writer(v)
+            if writer is not None:
+                stack.append(writer)
+            while stack:
+                try:
+                    v = next(stack[-1])
+                    break
+                except StopIteration:
+                    stack.pop()
+            else:
+                return
 
 
 class Logger:
@@ -363,12 +591,21 @@ class Logger:
     ):
         self._name = name
         self._stream = stream
-        self._indents: list[str] = [""]
-        self._indents_buffer: TextIO = StringIO()
+        # Indentation widths, the current line width, and the indents text
+        # (only tracked when debug.print_indent_chars is on)
+        self._indents: list[int] = [0]
+        self._indent_col = 0
+        self._indents_chars: list[str] | None = None
+        self._indents_buffer: list[str] = []
+        self._out_buffer: list[str] = []
         self._data_printer = DataPrinter(self)
         self._current_path: list[str | int] = ["root"]
         self._config = None
         self._kwargs: LoggerKwargs = None
+        self._write_options: _WriteOptions | None = None
+        self._flush_countdown = 0
+        self._fallback_checked = False
+        self._flat_defaults: tuple | None = None
 
     def get_config_key(self) -> str:
         return f"loggers.{self._name}"
@@ -404,11 +641,23 @@ class Logger:
         try:
             def_stream = None
             self._kwargs = LoggerKwargs(self, **kwargs)
-            self._indents = [""]
-            self._current_path = ["root"]
             if "stream" in kwargs.keys():
                 def_stream = self._stream
                 self._stream = cast(TextIO, kwargs["stream"])
+            # Resolve _write options once for the whole call
+            self._write_options = _WriteOptions(
+                # Nobody watches an animation written to a file or a pipe
+                animate=bool(self._kwargs.get("animate") and _isatty(self._stream)),
+                flush_rate=self._kwargs.get("flush_rate"),
+                process_ansi=self._kwargs.get("ansi"),
+                muted=self._kwargs.get("verbose_only")
+                and not self._kwargs.get("verbose"),
+            )
+            self._indents = [0]
+            self._indent_col = 0
+            if self._kwargs.get("debug.print_indent_chars"):
+                self._indents_chars = [""]
+            self._current_path = ["root"]
             if self._kwargs.get("debug.fallback"):
                 if not self._fallback_checked:
                     self._fallback_checked = True
@@ -422,151 +671,278 @@ class Logger:
         except Exception as e:
             raise e
         finally:
+            self._flush_out_buffer()
             self._stream.flush()
-            self._indents = [""]
-            self._indents_buffer.seek(0)
-            self._indents_buffer.truncate(0)
+            self._indents = [0]
+            self._indent_col = 0
+            self._indents_chars = None
+            self._indents_buffer.clear()
             self._kwargs = None
+            self._write_options = None
+            self._flush_countdown = 0
             if def_stream is not None:
                 self._stream = def_stream
 
     def print(self, *args, **kwargs) -> None:
-        if "end" not in kwargs:
-            args = [*args, "\n"]
-        else:
-            args = [*args, kwargs["end"]]
-            del kwargs["end"]
-        return self.write(*args, **kwargs)
+        end = kwargs.pop("end", "\n")
+        return self.write(*args, end, **kwargs)
 
     def error(self, *args, **kwargs) -> None:
-        args = [f"/;_cross/cr;/ ", *args]
-        return self.print(*args, **kwargs)
+        return self.print("/;_cross/cr;/ ", *args, **kwargs)
 
     def critical(self, *args, **kwargs) -> None:
-        args = [f"/;cr;bo//;_cross/;/ ", *args, "/;"]
-        return self.print(*args, **kwargs)
+        return self.print("/;cr;bo//;_cross/;/ ", *args, "/;", **kwargs)
 
     def success(self, *args, **kwargs) -> None:
-        args = [f"/;_check/cg;/ ", *args]
-        return self.print(*args, **kwargs)
+        return self.print("/;_check/cg;/ ", *args, **kwargs)
 
     def prompt(self, *args, **kwargs) -> None:
-        args = [f"/;_arrow/cb;bo;/ ", *args]
-        return self.print(*args, **kwargs)
+        return self.print("/;_arrow/cb;bo;/ ", *args, **kwargs)
 
     def debug(self, *args, **kwargs) -> None:
-        args = [f"/;cm;bo//;_wrench/;/ ", *args, "/;"]
-        return self.print(*args, **kwargs)
+        return self.print("/;cm;bo//;_wrench/;/ ", *args, "/;", **kwargs)
 
     def _indent(self) -> None:
-        indents_char = self._indents_buffer.getvalue()
-        indents_char = re.sub(
-            r"\x1b\[[0-9;]*m", "", indents_char
-        )  # just in case some are still here.
-        self._indents.append(indents_char)
+        self._indents.append(self._indent_col)
+        if self._indents_chars is not None:
+            # ANSI escapes never reach the indents buffer (see _write), no strip needed.
+            self._indents_chars.append("".join(self._indents_buffer))
 
     def _dindent(self) -> None:
         self._indents.pop()
+        if self._indents_chars is not None:
+            self._indents_chars.pop()
 
     def _new_line(self, indent_char=" ") -> None:
-        self._stream.write("\n")
-        indents_char = self._indents[-1]
+        indent_col = self._indents[-1]
 
+        # Emit the new line and its indentation in a single write.
+        out = "\n"
         if len(self._indents) > 1:
-            if self._kwargs.get("debug.print_indent_chars"):
-                self._stream.write(
+            if self._indents_chars is not None:
+                indents_char = self._indents_chars[-1]
+                out += (
                     _ansi_tag_text("cm;di")
                     + self._name
                     + ":"
                     + indents_char[len(self._name) + 1 :]
                     + _ansi_tag_text("r")
                 )
+                self._indents_buffer.clear()
+                self._indents_buffer.append(indents_char)
             else:
-                self._stream.write(indent_char * len(indents_char))
-        elif len(self._indents[0]) > 0:
+                out += indent_char * indent_col
+        elif self._indents[0] > 0:
             raise RuntimeError(
                 "Logger internal error: _indents stack corrupted (len > 1 with non-empty base)"
             )
-        self._indents_buffer.seek(0)
-        self._indents_buffer.truncate(0)
-        self._indents_buffer.write(indents_char)
+        elif self._indents_chars is not None:
+            self._indents_buffer.clear()
+        self._out_buffer.append(out)
+        self._indent_col = indent_col
+
+    def _write_no_ansi(self, *args) -> None:
+        # Hot loop locals
+        out_append = self._out_buffer.append
+        indents_append = self._indents_buffer.append
+        track_chars = self._indents_chars is not None
+        new_line = self._new_line
+        write_value = self._data_printer._write_value
+        ansi_escape_match = _ansi_escape_match
+        next_sentinel = _PLAIN_SENTINELS_RE.search
+
+        for arg in args:
+            if not isinstance(arg, str):
+                write_value(arg)
+                continue
+            # Nothing to interpret: write it at once
+            if "\n" not in arg and "\x1b" not in arg:
+                out_append(arg)
+                self._indent_col += len(arg)
+                if track_chars:
+                    indents_append(arg)
+                continue
+            pos = 0
+            end = len(arg)
+            while pos < end:
+                # Jump to the next new line or ansi code
+                found = next_sentinel(arg, pos)
+                stop = found.start() if found else end
+
+                # Write the plain run at once
+                if stop > pos:
+                    run = arg[pos:stop]
+                    out_append(run)
+                    self._indent_col += len(run)
+                    if track_chars:
+                        indents_append(run)
+                if stop == end:
+                    break
+
+                # Manage new lines
+                if arg[stop] == "\n":
+                    new_line(" ")
+                    pos = stop + 1
+                    continue
+
+                # Ansi codes: write all at once, do not add to indent buffer
+                ansi_match = ansi_escape_match(arg, stop)
+                out_append(ansi_match.group(0))
+                pos = ansi_match.end()
 
     def _write(self, *args) -> None:
 
-        animate = self._kwargs.get("animate")
-        flush_rate = self._kwargs.get("flush_rate")
-        process_ansi = self._kwargs.get("ansi")
-        verbose = self._kwargs.get("verbose")
-        verbose_only = self._kwargs.get("verbose_only")
+        animate, flush_rate, process_ansi, muted = self._write_options
 
-        if verbose_only and not verbose:
+        if muted:
             return
 
+        # No pattern to process: stream plain runs in bulk.
+        if not process_ansi and not animate:
+            return self._write_no_ansi(*args)
+
+        sentinels_re = _SENTINELS_RE if process_ansi else _PLAIN_SENTINELS_RE
+
+        # Hot loop locals
+        out_append = self._out_buffer.append
+        indents_append = self._indents_buffer.append
+        track_chars = self._indents_chars is not None
+        new_line = self._new_line
+        write_value = self._data_printer._write_value
+        ansi_escape_match = _ansi_escape_match
+        detect = _detect_ansi_pattern
+        next_sentinel = sentinels_re.search
+        ansi_mark = _ANSI_MARK
+
         for arg in args:
             if not isinstance(arg, str):
-                self._data_printer._write_value(arg)
-            else:
-                remaining = arg
-                security_limit = len(remaining) + 10000
-                loops = 0
-                while remaining:
-                    loops += 1
-                    # Mange ANSI patterns on the fly
-                    lookahead = remaining[0:2]
-                    if process_ansi and lookahead == _ANSI_MARK:
-                        ansi = _detect_ansi_pattern(remaining)
-                        remaining = ansi[1] + remaining[len(ansi[0]) :]
-                        # Do not let the kraken grow...
-                        if loops > security_limit:
-                            raise KrakenError(
-                                f"Pattern recursion limit exceeded. You may have an kraken growing in {remaining[0:60]}!"
-                            )
-                        # Continue to provide recursive patterns
-                        continue
-
-                    # Get the char
-                    char = remaining[0]
-
-                    # Manage new lines
-                    if char == "\n":
-                        remaining = remaining[1:]
-                        self._new_line(" ")
-                        continue
-
-                    # Optim: ansi codes => write all at once, do not add to indent buffer
-                    if char == "\x1b":
-                        lookahead = remaining[
-                            0 : max(20, len(remaining))
-                        ]  # 20 should be enough for ansi codes
-                        ansi_match = re.match(r"\x1b\[[0-9;]*m", lookahead).group(0)
-                        self._stream.write(ansi_match)
-                        remaining = remaining[len(ansi_match) :]
-                        continue
-
-                    # Write the char
-                    self._stream.write(char)
-                    self._indents_buffer.write(char)
-
-                    # Consume the char
-                    remaining = remaining[1:]
-
-                    # Check no animation mode
-                    if not animate:
-                        continue
-
-                    # Flush based on flush rate
-                    if len(remaining) == 0:
-                        self._stream.flush()
-                        continue
-                    mod = max(1, random.randint(flush_rate[0], flush_rate[1]))
-                    if len(remaining) % mod == 0:
-                        self._stream.flush()
-                        sleep(random.uniform(0.01, 0.03))
+                write_value(arg)
+                continue
+            # Nothing to interpret: write it at once
+            if (
+                not animate
+                and ansi_mark not in arg
+                and "\n" not in arg
+                and "\x1b" not in arg
+            ):
+                out_append(arg)
+                self._indent_col += len(arg)
+                if track_chars:
+                    indents_append(arg)
+                continue
+            # Pattern expansions are stacked over the text they come from
+            stack = [[arg, 0]]
+            # Expansions only, plain runs and escapes always move forward
+            security_limit = len(arg) + 10000
+            expansions = 0
+            while stack:
+                frame = stack[-1]
+                remaining, pos = frame
+                end = len(remaining)
+                if pos == end:
+                    stack.pop()
+                    continue
+
+                # Jump to the next new line, ansi code or pattern
+                found = next_sentinel(remaining, pos)
+                stop = found.start() if found else end
+
+                # Write the plain run at once
+                if stop > pos:
+                    run = remaining[pos:stop]
+                    if animate:
+                        self._write_animated(run, flush_rate)
+                    else:
+                        out_append(run)
+                    self._indent_col += len(run)
+                    if track_chars:
+                        indents_append(run)
+                    frame[1] = pos = stop
+                if pos == end:
+                    continue
+
+                # Mange ANSI patterns on the fly
+                if process_ansi and remaining.startswith(ansi_mark, pos):
+                    frame[1], expansion = detect(remaining, pos)
+                    stack.append([expansion, 0])
+                    # Do not let the kraken grow...
+                    expansions += 1
+                    if expansions > security_limit:
+                        kraken = "".join(s[i:] for s, i in reversed(stack))
+                        raise KrakenError(
+                            f"Pattern recursion limit exceeded. You may have an kraken growing in {kraken[0:60]}!"
+                        )
+                    # Continue to provide recursive patterns
+                    continue
+
+                # Manage new lines
+                if remaining[pos] == "\n":
+                    frame[1] = pos + 1
+                    new_line(" ")
+                    continue
+
+                # Optim: ansi codes => write all at once, do not add to indent buffer
+                ansi_match = ansi_escape_match(remaining, pos)
+                out_append(ansi_match.group(0))
+                frame[1] = ansi_match.end()
+
+    def _write_escaped(
+        self, prefix: str, text: str, suffix: str, tail: str = ""
+    ) -> None:
+        # Raw escapes around text that is never scanned for markers
+        if (
+            self._write_options.animate
+            or "\n" in text
+            or "\x1b" in text
+            or "\n" in tail
+        ):
+            # New lines and animation still need the scanner, without markers
+            return self._write_plain(prefix + text + suffix + tail)
+        self._out_buffer.append(prefix + text + suffix + tail)
+        self._indent_col += len(text) + len(tail)
+        if self._indents_chars is not None:
+            self._indents_buffer.append(text + tail)
+
+    def _write_plain(self, *args) -> None:
+        # _write without interpreting markers, as with ansi off
+        options = self._write_options
+        self._write_options = options._replace(process_ansi=False)
+        try:
+            self._write(*args)
+        finally:
+            self._write_options = options
+
+    def _flush_out_buffer(self) -> None:
+        if self._out_buffer:
+            self._stream.write("".join(self._out_buffer))
+            self._out_buffer.clear()
+
+    def _write_animated(self, run: str, flush_rate: list[int]) -> None:
+        self._flush_out_buffer()
+        countdown = self._flush_countdown
+        if countdown <= 0:
+            countdown = max(1, random.randint(flush_rate[0], flush_rate[1]))
+        pos = 0
+        end = len(run)
+        while pos < end:
+            # Write up to the sampled flush point in one block
+            stop = min(pos + countdown, end)
+            self._stream.write(run[pos:stop])
+            countdown -= stop - pos
+            pos = stop
+
+            # Flush and pause once the sampled flush point is reached
+            if countdown == 0:
+                self._stream.flush()
+                sleep(random.uniform(0.01, 0.03))
+                countdown = max(1, random.randint(flush_rate[0], flush_rate[1]))
+        self._flush_countdown = countdown
 
 
 def create_default(stream: TextIO, verbose: bool = False) -> Logger:
-    global _default_kwargs
+    global _default_kwargs, _flat_default_kwargs
     _default_kwargs["verbose"] = verbose
+    _flat_default_kwargs = None
     return Logger(name="default", stream=stream)
 
 
@@ -609,7 +985,8 @@ def get(name: str = "default", fallback=False) -> Logger:
     from src import _loggers
 
     """Get or create a logger by name."""
-    if not name in _loggers.keys():
+    logger = _loggers.get(name)
+    if logger is None:
         if fallback:
             default_logger = _loggers["default"]
             if default_logger is None:
@@ -620,4 +997,4 @@ def get(name: str = "default", fallback=False) -> Logger:
             )
             return default_logger
         raise RuntimeError(f"Logger '{name}' not found. Use create() to create logger.")
-    return _loggers[name]
+    return logger
@@ -41,6 +41,18 @@ def dict_path(d: dict, path: str, default: any = None) -> any | None:
     return d
 
 
+def flatten_dict(d: dict, path: str = "") -> dict:
+    """Flatten nested dict into a dict of leaf values keyed by dotted path."""
+    flat = {}
+    for key, value in d.items():
+        key_path = f"{path}.{key}" if path else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten_dict(value, key_path))
+        else:
+            flat[key_path] = value
+    return flat
+
+
 def deep_merge_dicts(*dicts: dict) -> dict:
     dicts_list = list(copy.deepcopy(d) for d in dicts)
     while len(dicts_list) > 1:
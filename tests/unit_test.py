@@ -4,6 +4,29 @@ from typing import cast
 
 from src import Logger, Config, Cli, AppPath
 
+# Parsed test data by (path, mtime): re-runs in the same process skip parsing.
+# The module is reloaded on each invocation, keep the cache across reloads.
+try:
+    _test_data_cache
+except NameError:
+    _test_data_cache: dict[tuple[str, float], any] = {}
+
+# Cache miss marker, parsed data may be None (JSON null)
+_NOT_CACHED = object()
+
+
+def _read_test_data(read_path: AppPath.AppPath) -> any:
+    try:
+        key = (str(read_path.path), read_path.path.stat().st_mtime)
+    except OSError:
+        # Let read_json report it
+        return read_path.read_json()
+    data = _test_data_cache.get(key, _NOT_CACHED)
+    if data is _NOT_CACHED:
+        data = read_path.read_json()
+        _test_data_cache[key] = data
+    return data
+
 
 class UnitTest(Cli.CliModule):
     """Unit test CLI module."""
@@ -168,7 +191,7 @@ class UnitTest(Cli.CliModule):
                 for read_path in cast(
                     list[AppPath.AppPath], self.get_arg("--test-data")
                 ):
-                    print_test_data(read_path.read_json())
+                    print_test_data(_read_test_data(read_path))
             if self.get_arg("--test-data-dir"):
                 for read_dir in cast(
                     list[AppPath.AppPath], self.get_arg("--test-data-dir")
@@ -176,7 +199,7 @@ class UnitTest(Cli.CliModule):
                     dir_path = read_dir
                     self._unit_test_logger.prompt(f"Reading test data from {read_dir}")
                     for read_path in dir_path.glob("*.json"):
-                        print_test_data(read_path.read_json())
+                        print_test_data(_read_test_data(read_path))
             if not self.get_arg("--test-data") and not self.get_arg("--test-data-dir"):
                 self._unit_test_logger.prompt(
                     "No test data provided. Printing logger configuration:"